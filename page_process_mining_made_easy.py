@@ -5,14 +5,27 @@ It allows users to load data from files or use example datasets, define relevant
 process mining analysis to generate statistics and visualizations.
 Functions:
     clear_tempfiles(): Deletes files in the temporary files folder that are older than one hour.
+    make_visualization_file_path(prefix, *content): Returns a file path in the temporary files folder named by a hash of the content.
+    save_visualization_to_file(save_function, file_path, *args, **kwargs): Saves a visualization to the file path, if it does not exist yet.
     make_text_from_seconds(seconds): Converts seconds to a string with time in seconds, minutes, hours, days, weeks, or months.
+    make_text_from_seconds_array(seconds): Vectorized version of make_text_from_seconds for an array of seconds.
 """
 import os
 import time
+import hashlib
+import uuid
+import importlib.util
 import streamlit as st
 import numpy as np
 import pandas as pd
-import pm4py
+#pm4py is imported where it is used, it is heavy to import and not needed until an event log is created
+
+#use the faster Rust based calamine engine to read Excel files if available, pandas supports it from version 2.2
+pandas_version = tuple(int(part) for part in pd.__version__.split(".")[:2])
+if importlib.util.find_spec("python_calamine") is not None and pandas_version >= (2, 2):
+    EXCEL_ENGINE = "calamine"
+else:
+    EXCEL_ENGINE = "openpyxl"
 
 st.set_page_config(page_title="Process Mining made easy", page_icon="⛏️", layout="wide")
 st.title("Process Mining made easy")
@@ -39,19 +52,53 @@ def clear_tempfiles():
     now = time.time()
     cutoff = now - 3600  # 1 hour ago
 
-    for filename in os.listdir(temp_folder):
-        file_path = os.path.join(temp_folder, filename)
-        if os.path.isfile(file_path):
-            file_modified_time = os.path.getmtime(file_path)
-            if file_modified_time < cutoff:
-                os.remove(file_path)
+    with os.scandir(temp_folder) as entries: #scandir provides the file type from the directory listing, saves one stat call per file
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
 
 clear_tempfiles() #deletes all files in tempfiles older than 1 hour
 
-@st.cache_data
+def make_visualization_file_path(prefix, *content):
+    """
+    Returns a png file path in the temporary folder, named by a hash of the content which is visualized.
+    Same content results in the same file path, so an already rendered visualization can be reused.
+    Parameters:
+        prefix (str): Prefix of the file name
+        content: Everything the visualization depends on, dictionaries are sorted to get a stable hash
+    Returns:
+        str: File path
+    """
+    content = tuple(sorted(c.items()) if isinstance(c, dict) else c for c in content)
+    key = hashlib.blake2b(repr(content).encode(), digest_size=16).hexdigest()
+    return TEMPORARY_FILES_FOLDER_NAME + "/" + f"{prefix}_{key}.png"
+
+def save_visualization_to_file(save_function, file_path, *args, **kwargs):
+    """
+    Saves a visualization with a pm4py save function, if the file does not exist yet.
+    The visualization is saved to a unique temporary file first and then moved to the file path,
+    so that other sessions never see a partly written file.
+    Parameters:
+        save_function (function): PM4Py save function, e.g. pm4py.vis.save_vis_dfg
+        file_path (str): File path, usually from make_visualization_file_path
+        args, kwargs: Arguments of the save function, without the file path
+    Returns: None
+    """
+    if os.path.exists(file_path): #already rendered within the last hour
+        return
+    temporary_file_path = TEMPORARY_FILES_FOLDER_NAME + "/" + f"tmp_{uuid.uuid4().hex}.png"
+    try:
+        save_function(*args, temporary_file_path, **kwargs)
+        os.replace(temporary_file_path, file_path)
+    finally:
+        if os.path.exists(temporary_file_path): #rendering failed
+            os.remove(temporary_file_path)
+
+@st.cache_data(persist="disk", show_spinner=False)
 def load_file_to_dataframe(filename):
     """Loads file and returns event log.
     Extra function used to allow streamlit caching of data, so that dataload is not done with every re-run.
+    Cache is persisted to disk, so that the file is not parsed again after a restart of the app.
 
     Args:
         filename (str): File name
@@ -59,60 +106,195 @@ def load_file_to_dataframe(filename):
     Returns:
         dataframe: Pandas dataframe
     """
-    df = pd.read_excel(filename, sheet_name=0)
+    df = pd.read_excel(filename, sheet_name=0, engine=EXCEL_ENGINE)
     return df
 
 @st.cache_data
+def load_example_purchase_orders():
+    """Returns example data with purchase orders.
+    Extra function used to allow streamlit caching of data, so that the dataframe is not created with every re-run.
+
+    Returns:
+        dataframe: Pandas dataframe
+    """
+    example_data = {
+        'case_id': ["1", "1", "1", "1", "1", 
+                    "2", "2", "2", "2", "2", 
+                    "3", "3", "3", "3", "3", "3", 
+                    "4", "4", "4", "4", "4"],
+        'activity': ["Create purchase order", "Select vendor", "Send PO", "Receive goods", "Authorize invoice", 
+                     "Create purchase order", "Select vendor", "Send PO", "Receive goods", "Authorize invoice", 
+                     "Create purchase order", "Select vendor", "Send PO", "Receive goods", "Quality defect", "Authorize invoice", 
+                     "Create purchase order", "Select vendor", "Send PO", "Receive goods", "Authorize invoice"],
+        'timestamp': pd.to_datetime(["01.10.2023", "03.10.2023", "04.10.2023", "03.11.2023", "08.11.2023", 
+                                     "04.10.2023", "09.10.2023", "12.10.2023", "02.11.2023", "11.11.2023", 
+                                     "18.10.2023", "23.10.2023", "23.10.2023", "30.10.2023", "03.11.2023", "25.11.2023", 
+                                     "01.11.2023", "08.11.2023", "12.11.2023", "01.12.2023", "08.12.2023"], format="%d.%m.%Y")
+    }
+    return pd.DataFrame(example_data)
+
+@st.cache_data
+def load_example_tablet_production():
+    """Returns example data with tablet production, activities have a start and an end timestamp.
+    Extra function used to allow streamlit caching of data, so that the dataframe is not created with every re-run.
+
+    Returns:
+        dataframe: Pandas dataframe
+    """
+    example_data = {
+        'case_id': ["1", "1", "1", 
+                    "2", "2", "2", 
+                    "3", "3", "3", 
+                    "4", "4", "4", "4", 
+                    "5", "5", "5", "5"],
+        'activity': ["Granulation", "Tabletting", "Coating", 
+                     "Granulation", "Tabletting", "Coating", 
+                     "Granulation", "Tabletting", "Coating", 
+                     "Granulation", "Tabletting", "Coating", "Sorting", 
+                     "Granulation", "Tabletting", "Coating", "Sorting"],
+        'timestamp_start': pd.to_datetime(["01.10.2023", "14.10.2023", "18.10.2023", 
+                                     "04.10.2023", "12.10.2023", "18.10.2023", 
+                                     "09.10.2023", "19.10.2023", "25.10.2023", 
+                                     "11.10.2023", "20.10.2023", "24.10.2023", "30.10.2023", 
+                                     "18.10.2023", "24.10.2023", "31.10.2023", "04.11.2023"], format="%d.%m.%Y"),
+        'timestamp_end': pd.to_datetime(["10.10.2023", "17.10.2023", "22.10.2023", 
+                                     "08.10.2023", "14.10.2023", "24.10.2023", 
+                                     "10.10.2023", "23.10.2023", "30.10.2023", 
+                                     "17.10.2023", "23.10.2023", "29.10.2023", "02.11.2023", 
+                                     "22.10.2023", "27.10.2023", "03.11.2023", "08.11.2023"], format="%d.%m.%Y"),
+    }
+    return pd.DataFrame(example_data)
+
+@st.cache_resource
 def load_event_log_from_dataframe(df, case_column, activity_column, timestamp_column, timestamp_end_column = None):
     """Loads dataframe and returns event log.
     Extra function used to allow streamlit caching of data, so that dataload is not done with every re-run.
+    The event log is cached as resource and returned without copying, it is shared by all sessions and must not be changed.
 
     Args:
         df (dataframe): Pandas dataframe
 
     Returns:
-        event log: PM4Py event log
+        dataframe: PM4Py event log, formatted pandas dataframe
     """
+    import pm4py
     if timestamp_end_column is None:
         new_log = pm4py.format_dataframe(df, case_id=case_column, activity_key=activity_column, timestamp_key=timestamp_column)
     else:
         #convert data, each row is split into two rows, one for start and one for end
-        new_data = {case_column: [], activity_column: [], timestamp_column: []}
-        for i, row in df.iterrows():
-            new_data[case_column].append(row[case_column])
-            new_data[activity_column].append(str(row[activity_column]) + "_start")
-            new_data[timestamp_column].append(row[timestamp_column])
-            new_data[case_column].append(row[case_column])
-            new_data[activity_column].append(str(row[activity_column]) + "_end")
-            new_data[timestamp_column].append(row[timestamp_end_column])
-        df_new = pd.DataFrame(new_data)
+        activities = df[activity_column]
+        if not pd.api.types.is_string_dtype(activities): #convert only if needed, e.g. numeric activities or missing values
+            activities = activities.astype(str)
+        df_start = df[[case_column]].copy()
+        df_start[activity_column] = activities + "_start"
+        df_start[timestamp_column] = df[timestamp_column]
+        df_end = df[[case_column]].copy()
+        df_end[activity_column] = activities + "_end"
+        df_end[timestamp_column] = df[timestamp_end_column]
+        #interleave on the original index, so that start and end of each row follow each other like in the original data,
+        #pm4py.format_dataframe uses this order for events with the same timestamp
+        df_new = pd.concat([df_start, df_end]).sort_index(kind="stable").reset_index(drop=True)
         new_log = pm4py.format_dataframe(df_new, case_id=case_column, activity_key=activity_column, timestamp_key=timestamp_column)
     return new_log
 
+#the event log is kept as the pandas dataframe returned by pm4py.format_dataframe, do not convert it with
+#pm4py.convert_to_event_log, pm4py uses its faster dataframe based implementations when getting a dataframe
+
+@st.cache_data
+def calculate_start_activities(event_log):
+    """Returns the start activities of the event log with their number of cases.
+
+    Args:
+        event_log (dataframe): PM4Py event log
+
+    Returns:
+        dict: Activity as key, number of cases as value
+    """
+    import pm4py
+    return pm4py.get_start_activities(event_log)
+
+@st.cache_data
+def calculate_end_activities(event_log):
+    """Returns the end activities of the event log with their number of cases.
+
+    Args:
+        event_log (dataframe): PM4Py event log
+
+    Returns:
+        dict: Activity as key, number of cases as value
+    """
+    import pm4py
+    return pm4py.get_end_activities(event_log)
+
+@st.cache_data
+def filter_event_log_by_variant(event_log, variant):
+    """Returns the event log filtered to the cases of a single variant.
+
+    Args:
+        event_log (dataframe): PM4Py event log
+        variant (tuple): Variant to keep
+
+    Returns:
+        event log: Filtered PM4Py event log
+    """
+    import pm4py
+    return pm4py.filter_variants(event_log, [variant])
+
+@st.cache_data
+def discover_dfg_from_event_log(event_log):
+    """Returns the directly-follows graph of the event log.
+
+    Args:
+        event_log (dataframe): PM4Py event log
+
+    Returns:
+        tuple: dfg, start activities, end activities
+    """
+    import pm4py
+    return pm4py.discover_dfg(event_log.copy()) #pm4py adds columns in place, event log is shared by all sessions
+
+@st.cache_data
+def discover_performance_dfg_from_event_log(event_log):
+    """Returns the performance directly-follows graph of the event log.
+
+    Args:
+        event_log (dataframe): PM4Py event log
+
+    Returns:
+        tuple: performance dfg, start activities, end activities
+    """
+    import pm4py
+    return pm4py.discover_performance_dfg(event_log.copy()) #pm4py adds columns in place, event log is shared by all sessions
+
 @st.cache_data
 def calculate_statistics_from_event_log(the_log):
-    #get all case durations and write some basic statistics
-    log_case_durations = pm4py.get_all_case_durations(log)
-    log_case_durations = np.array(log_case_durations)
+    #calculate duration and variant of each case once (columns are named by pm4py.format_dataframe)
+    df_cases = the_log.groupby('case:concept:name', sort=False).agg(
+        variant=('concept:name', tuple),
+        start=('time:timestamp', 'min'),
+        end=('time:timestamp', 'max'),
+    )
+    df_cases['duration'] = (df_cases['end'] - df_cases['start']).dt.total_seconds()
 
-    log_variants = pm4py.get_variants(log)
-    log_variants = dict(sorted(log_variants.items(), key=lambda item: item[1], reverse=True)) #sort dictionary by value in descending order, to ensure that list_of_variants is in descending order
-    list_of_variants = list(log_variants.keys())
+    #get all case durations and write some basic statistics
+    log_case_durations = df_cases['duration'].to_numpy()
 
     # st.text(f"""
     #         The dataset contains {len(log_case_durations)} cases with an average case duration of {make_text_from_seconds(np.mean(log_case_durations))}.  
     #         There are {len(log_variants)} different variants in the dataset.
     #         """)
 
-    #create dataframe with main kpis
+    #create dataframe with main kpis, all statistics are calculated on the per case durations from above
+    case_duration_kpis = df_cases['duration'].agg(['mean', 'median', 'min', 'max'])
+    case_duration_kpis['std'] = df_cases['duration'].std(ddof=0) #population stdev, same as np.std
     df_kpis = pd.DataFrame(
         {
             '# of cases': [len(log_case_durations)],
-            'mean duration': [make_text_from_seconds(np.mean(log_case_durations))],
-            'median duration': [make_text_from_seconds(np.median(log_case_durations))],
-            'minimum duration': [make_text_from_seconds(np.min(log_case_durations))],
-            'maximum duration': [make_text_from_seconds(np.max(log_case_durations))],
-            'stdev duration': [make_text_from_seconds(np.std(log_case_durations))]
+            'mean duration': [make_text_from_seconds(case_duration_kpis['mean'])],
+            'median duration': [make_text_from_seconds(case_duration_kpis['median'])],
+            'minimum duration': [make_text_from_seconds(case_duration_kpis['min'])],
+            'maximum duration': [make_text_from_seconds(case_duration_kpis['max'])],
+            'stdev duration': [make_text_from_seconds(case_duration_kpis['std'])]
         }
     )
     # st.dataframe(df_kpis, hide_index=True)
@@ -120,19 +302,19 @@ def calculate_statistics_from_event_log(the_log):
     #find number of variants
     # st.subheader("Variant details")
 
-    #change log variants dictionary, value should be dictionary with '# of cases' as key and old value as value
-    log_variants = {k: {"# of cases": v} for k, v in log_variants.items()}
+    #aggregate the kpis of all variants in a single groupby instead of filtering the log for each variant
+    variant_durations = df_cases.groupby('variant', sort=False)['duration']
+    df_variant_kpis = variant_durations.agg(['count', 'mean', 'median', 'min', 'max'])
+    df_variant_kpis['std'] = variant_durations.std(ddof=0) #population stdev, same as np.std
+    df_variant_kpis.columns = ['# of cases', 'mean duration', 'median duration', 'min duration', 'max duration', 'stdev duration']
+    #sort variants by number of cases in descending order, to ensure that list_of_variants is in descending order
+    df_variant_kpis = df_variant_kpis.sort_values(by='# of cases', ascending=False, kind="stable")
+    list_of_variants = list(df_variant_kpis.index)
+    for duration_column in df_variant_kpis.columns[1:]: #format all variants at once instead of calling make_text_from_seconds per value
+        df_variant_kpis[duration_column] = make_text_from_seconds_array(df_variant_kpis[duration_column])
 
-    #add all the other kpis to the dictionary
-    for variant, kpis in log_variants.items():
-        filtered_log = pm4py.filter_variants(log, [variant])
-        filtered_log_case_durations = pm4py.get_all_case_durations(filtered_log)
-        filtered_log_case_durations = np.array(filtered_log_case_durations)
-        kpis["mean duration"] = make_text_from_seconds(np.mean(filtered_log_case_durations))
-        kpis["median duration"] = make_text_from_seconds(np.median(filtered_log_case_durations))
-        kpis["min duration"] = make_text_from_seconds(np.min(filtered_log_case_durations))
-        kpis["max duration"] = make_text_from_seconds(np.max(filtered_log_case_durations))
-        kpis["stdev duration"] = make_text_from_seconds(np.std(filtered_log_case_durations))
+    #log variants dictionary, variant (tuple of activities) as key, dictionary with '# of cases' and all the other kpis as value
+    log_variants = df_variant_kpis.to_dict('index')
 
     #create new dict from log_variants, key is joined with ., value is same
     log_variants_new = {('.'.join(k)): v for k, v in log_variants.items()}
@@ -163,6 +345,25 @@ def make_text_from_seconds(seconds):
     else:
         return f"{round(seconds / 2592000, 1)} months"
 
+def make_text_from_seconds_array(seconds):
+    '''
+    Vectorized version of make_text_from_seconds, converts an array of seconds to an array of strings in one go.
+    '''
+    seconds = np.asarray(seconds, dtype=float)
+    is_nan = np.isnan(seconds)
+    seconds = np.where(is_nan, 0, seconds) #avoid invalid casts of nan, these are replaced by "-" below
+    conditions = [is_nan, seconds < 60 * 2, seconds < 3600 * 1, seconds < 86400 * 1, seconds < 604800 * 2, seconds < 2592000 * 1]
+    choices = [
+        "-",
+        np.char.add(np.round(seconds).astype(int).astype(str), " seconds"),
+        np.char.add(np.round(seconds / 60).astype(int).astype(str), " minutes"),
+        np.char.add(np.round(seconds / 3600, 1).astype(str), " hours"),
+        np.char.add(np.round(seconds / 86400, 1).astype(str), " days"),
+        np.char.add(np.round(seconds / 604800, 1).astype(str), " weeks"),
+    ]
+    default = np.char.add(np.round(seconds / 2592000, 1).astype(str), " months")
+    return np.select(conditions, choices, default)
+
 
 df = None
 log = None
@@ -189,49 +390,11 @@ if select_load_procedure == "Load from file":
 
 if select_load_procedure == "Load example data 1 - Purchase orders":
     view_process_visualization_expanded = True
-    # Load example dataframe
-    example_data = {
-        'case_id': ["1", "1", "1", "1", "1", 
-                    "2", "2", "2", "2", "2", 
-                    "3", "3", "3", "3", "3", "3", 
-                    "4", "4", "4", "4", "4"],
-        'activity': ["Create purchase order", "Select vendor", "Send PO", "Receive goods", "Authorize invoice", 
-                     "Create purchase order", "Select vendor", "Send PO", "Receive goods", "Authorize invoice", 
-                     "Create purchase order", "Select vendor", "Send PO", "Receive goods", "Quality defect", "Authorize invoice", 
-                     "Create purchase order", "Select vendor", "Send PO", "Receive goods", "Authorize invoice"],
-        'timestamp': pd.to_datetime(["01.10.2023", "03.10.2023", "04.10.2023", "03.11.2023", "08.11.2023", 
-                                     "04.10.2023", "09.10.2023", "12.10.2023", "02.11.2023", "11.11.2023", 
-                                     "18.10.2023", "23.10.2023", "23.10.2023", "30.10.2023", "03.11.2023", "25.11.2023", 
-                                     "01.11.2023", "08.11.2023", "12.11.2023", "01.12.2023", "08.12.2023"], format="%d.%m.%Y")
-    }
-    df = pd.DataFrame(example_data)
+    df = load_example_purchase_orders()
 
 if select_load_procedure == "Load example data 2 - Tablet production":
     view_process_visualization_expanded = True
-    # Load example dataframe
-    example_data = {
-        'case_id': ["1", "1", "1", 
-                    "2", "2", "2", 
-                    "3", "3", "3", 
-                    "4", "4", "4", "4", 
-                    "5", "5", "5", "5"],
-        'activity': ["Granulation", "Tabletting", "Coating", 
-                     "Granulation", "Tabletting", "Coating", 
-                     "Granulation", "Tabletting", "Coating", 
-                     "Granulation", "Tabletting", "Coating", "Sorting", 
-                     "Granulation", "Tabletting", "Coating", "Sorting"],
-        'timestamp_start': pd.to_datetime(["01.10.2023", "14.10.2023", "18.10.2023", 
-                                     "04.10.2023", "12.10.2023", "18.10.2023", 
-                                     "09.10.2023", "19.10.2023", "25.10.2023", 
-                                     "11.10.2023", "20.10.2023", "24.10.2023", "30.10.2023", 
-                                     "18.10.2023", "24.10.2023", "31.10.2023", "04.11.2023"], format="%d.%m.%Y"),
-        'timestamp_end': pd.to_datetime(["10.10.2023", "17.10.2023", "22.10.2023", 
-                                     "08.10.2023", "14.10.2023", "24.10.2023", 
-                                     "10.10.2023", "23.10.2023", "30.10.2023", 
-                                     "17.10.2023", "23.10.2023", "29.10.2023", "02.11.2023", 
-                                     "22.10.2023", "27.10.2023", "03.11.2023", "08.11.2023"], format="%d.%m.%Y"),
-    }
-    df = pd.DataFrame(example_data)
+    df = load_example_tablet_production()
     st.info("Try to set timestamp_end columns to 'timestamp_end to see how the activities are automatically split into start/end.")
 
 #read excel file first sheet as pandas dataframe
@@ -287,38 +450,21 @@ if "df" in locals() and df is not None:
             timestamp_end_column = st.selectbox("Select column for timestamp end", df.columns, index=index_timestamp_end_column)
             st.text(" If not available, leave empty. Defines the end timestamp for each activity. If defined, activities will be split in 'activity start' and 'activity end' events.")
 
-    #show warning if user selects the same column for case and activity
+    #show warning if user selects the same column for more than one of case, activity, timestamp start and timestamp end
     any_warning = False
-    if case_column == activity_column:
-        st.warning("Case and activity column should be different")
-        any_warning = True
-    #show warning if user selects the same column for case and timestamp start
-    if case_column == timestamp_start_column:
-        st.warning("Case and timestamp start column should be different")
-        any_warning = True
-    #show warning if user selects the same column for case and timestamp end
-    if case_column == timestamp_end_column:
-        st.warning("Case and timestamp end column should be different")
-        any_warning = True
-    #show warning if user selects the same column for activity and timestamp start
-    if activity_column == timestamp_start_column:
-        st.warning("Activity and timestamp start column should be different")
-        any_warning = True
-    #show warning if user selects the same column for activity and timestamp end
-    if activity_column == timestamp_end_column:
-        st.warning("Activity and timestamp end column should be different")
-        any_warning = True
-    #show warning if user selects the same column for timestamp start and timestamp end
-    if timestamp_start_column == timestamp_end_column:
-        st.warning("Timestamp start and timestamp end column should be different")
+    selected_columns = {"case": case_column, "activity": activity_column, "timestamp start": timestamp_start_column, "timestamp end": timestamp_end_column}
+    selected_columns = {name: column for name, column in selected_columns.items() if column is not None} #timestamp end is optional
+    duplicate_names = [name for name, column in selected_columns.items() if list(selected_columns.values()).count(column) > 1]
+    if duplicate_names:
+        st.warning(f"Columns for {', '.join(duplicate_names)} should be different")
         any_warning = True
     #show warning if timestamp start column is not of type datetime
-    if df[timestamp_start_column].dtype != 'datetime64[ns]':
+    if not pd.api.types.is_datetime64_any_dtype(df[timestamp_start_column]): #also accepts timezone aware and other resolutions
         st.warning("Timestamp start column should be of type datetime, convert to datetime in Excel first")
         any_warning = True
     #show warning if timestamp end column is not of type datetime
     if timestamp_end_column is not None:
-        if df[timestamp_end_column].dtype != 'datetime64[ns]':
+        if not pd.api.types.is_datetime64_any_dtype(df[timestamp_end_column]):
             st.warning("Timestamp end column should be of type datetime, convert to datetime in Excel first")
             any_warning = True
     #convert dataframe to event log
@@ -338,7 +484,7 @@ if log is not None:
         #######################################
         log_case_durations, log_variants, list_of_variants, df_kpis, df_variants = calculate_statistics_from_event_log(log)
         st.text(f"""
-            The dataset contains {len(log_case_durations)} cases with an average case duration of {make_text_from_seconds(np.mean(log_case_durations))}.  
+            The dataset contains {len(log_case_durations)} cases with an average case duration of {df_kpis['mean duration'].iloc[0]}.  
             There are {len(log_variants)} different variants in the dataset.
             """)
         st.dataframe(df_kpis, hide_index=True)
@@ -353,7 +499,7 @@ if log is not None:
         start_end_activities_col1, start_end_activities_col2 = st.columns(2)
         with start_end_activities_col1:
             st.text("Start activities")
-            log_start_activities = pm4py.get_start_activities(log)
+            log_start_activities = calculate_start_activities(log)
             df_start_activities = pd.DataFrame.from_dict(log_start_activities, orient='index', columns=['# of cases'])
             df_start_activities = df_start_activities.reset_index().rename(columns={'index': 'activity'})
             df_start_activities = df_start_activities.sort_values(by='# of cases', ascending=False) #sort by number of cases in descending order
@@ -361,7 +507,7 @@ if log is not None:
         #find end activities
         with start_end_activities_col2:
             st.text("End activities")
-            log_end_activities = pm4py.get_end_activities(log)
+            log_end_activities = calculate_end_activities(log)
             df_end_activities = pd.DataFrame.from_dict(log_end_activities, orient='index', columns=['# of cases'])
             df_end_activities = df_end_activities.reset_index().rename(columns={'index': 'activity'})
             df_end_activities = df_end_activities.sort_values(by='# of cases', ascending=False)
@@ -377,15 +523,15 @@ if log is not None:
         if chosen_variant == "All":
             filtered_log = log
         else:
-            filtered_log = pm4py.filter_variants(log, [chosen_variant])
-        log_case_durations = pm4py.get_all_case_durations(log)
-        st.text(f"Filtered {len(pm4py.get_all_case_durations(filtered_log))} cases.")
+            filtered_log = filter_event_log_by_variant(log, chosen_variant)
+        #number of cases is already known from the variant statistics
+        st.text(f"Filtered {log_variants[chosen_variant]['# of cases'] if chosen_variant != 'All' else len(log_case_durations)} cases.")
 
 
         st.subheader("Statistics for filtered variant")
         #calculate dfg and performance dfg
-        performance_dfg, start_activities_perf_dfg, end_activities_perf_dfg = pm4py.discover_performance_dfg(filtered_log)
-        dfg, start_activities_dfg, end_activities_dfg = pm4py.discover_dfg(filtered_log)
+        performance_dfg, start_activities_perf_dfg, end_activities_perf_dfg = discover_performance_dfg_from_event_log(filtered_log)
+        dfg, start_activities_dfg, end_activities_dfg = discover_dfg_from_event_log(filtered_log)
         if len(dfg) > 0: #there are some activities found
             df_performance_dfg = pd.DataFrame.from_dict(performance_dfg, orient='index')
             # st.dataframe(df_performance_dfg, hide_index=False)
@@ -398,14 +544,9 @@ if log is not None:
             df_merged = df_merged.rename(columns={'mean': 'mean duration', 'median': 'median duration', 'min': 'min duration', 'max': 'max duration', 'stdev': 'stdev duration'})
             df_merged = df_merged.reset_index(names=['from', 'to'])
             df_merged = df_merged.sort_values(by='frequency', ascending=False)
-            #make all columns strings
-            df_merged = df_merged.astype(str)
-            #apply make_text_from_seconds to columns with time
-            df_merged['mean duration'] = df_merged['mean duration'].apply(lambda x: make_text_from_seconds(float(x)))
-            df_merged['median duration'] = df_merged['median duration'].apply(lambda x: make_text_from_seconds(float(x)))
-            df_merged['min duration'] = df_merged['min duration'].apply(lambda x: make_text_from_seconds(float(x)))
-            df_merged['max duration'] = df_merged['max duration'].apply(lambda x: make_text_from_seconds(float(x)))
-            df_merged['stdev duration'] = df_merged['stdev duration'].apply(lambda x: make_text_from_seconds(float(x)))
+            #apply make_text_from_seconds to columns with time, numeric columns are converted in one go
+            for duration_column in ['mean duration', 'median duration', 'min duration', 'max duration', 'stdev duration']:
+                df_merged[duration_column] = make_text_from_seconds_array(df_merged[duration_column])
             st.dataframe(df_merged, hide_index=True)
 
             #user settings for charts
@@ -432,16 +573,19 @@ if log is not None:
                     chosen_rankdir = "TB"
 
             #show visualizations
+            import pm4py
             if "Performance Graph" in chosen_visualizations:
                 st.subheader("Performance Directly-Follows Graph")
-                pm4py.vis.save_vis_performance_dfg(performance_dfg, start_activities_perf_dfg, end_activities_perf_dfg, TEMPORARY_FILES_FOLDER_NAME + "/" + "performance_dfg.png", 
-                                                aggregation_measure=chosen_aggregation_measure, rankdir=chosen_rankdir)
-                st.image(TEMPORARY_FILES_FOLDER_NAME + "/" + "performance_dfg.png")
+                performance_dfg_path = make_visualization_file_path("performance_dfg", performance_dfg, start_activities_perf_dfg, end_activities_perf_dfg, chosen_aggregation_measure, chosen_rankdir)
+                save_visualization_to_file(pm4py.vis.save_vis_performance_dfg, performance_dfg_path, performance_dfg, start_activities_perf_dfg, end_activities_perf_dfg, 
+                                           aggregation_measure=chosen_aggregation_measure, rankdir=chosen_rankdir)
+                st.image(performance_dfg_path)
 
             if "Frequency Graph" in chosen_visualizations:
                 st.subheader("Directly-Follows Graph with frequencies")
-                pm4py.vis.save_vis_dfg(dfg, start_activities_dfg, end_activities_dfg, TEMPORARY_FILES_FOLDER_NAME + "/" + "dfg.png", rankdir=chosen_rankdir)
-                st.image(TEMPORARY_FILES_FOLDER_NAME + "/" + "dfg.png")
+                dfg_path = make_visualization_file_path("dfg", dfg, start_activities_dfg, end_activities_dfg, chosen_rankdir)
+                save_visualization_to_file(pm4py.vis.save_vis_dfg, dfg_path, dfg, start_activities_dfg, end_activities_dfg, rankdir=chosen_rankdir)
+                st.image(dfg_path)
         else:
             st.write("No data for statistics or visualization available.")
 